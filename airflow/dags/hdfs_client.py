@@ -0,0 +1,86 @@
+"""
+Persistent HDFS shell
+One long-lived 'docker exec -i hadoop_client bash' session per task, so a
+series of hdfs dfs commands pays the docker exec start-up cost only once
+"""
+
+import queue
+import shlex
+import subprocess
+import threading
+import time
+
+SENTINEL = '---HDFS-END---'
+
+# Longest a single command may run before the session is treated as stuck
+DEFAULT_TIMEOUT_SECONDS = 3600
+
+
+class HdfsShell:
+    """bash session in the hadoop_client container, fed commands over stdin"""
+
+    def __init__(self, container='hadoop_client', timeout=DEFAULT_TIMEOUT_SECONDS):
+        self.timeout = timeout
+        self.proc = subprocess.Popen(
+            ['docker', 'exec', '-i', container, 'bash'],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+            text=True, bufsize=1
+        )
+        # Lines are read on a background thread so run() can wait with a timeout
+        self.lines = queue.Queue()
+        threading.Thread(target=self._read_output, daemon=True).start()
+
+    def _read_output(self):
+        """Forward session output line by line; None marks the end of the session"""
+        for line in self.proc.stdout:
+            self.lines.put(line)
+        self.lines.put(None)
+
+    def run(self, script, timeout=None):
+        """Run a bash snippet and return (exit code, combined stdout/stderr)
+
+        The snippet's stdin is /dev/null so nothing in it can swallow the
+        commands that follow. Completion is marked by a sentinel on its own
+        line (preceded by a newline, in case the output doesn't end with
+        one) carrying the exit code. Raises if no sentinel arrives within
+        the timeout, killing the session.
+        """
+        timeout = timeout or self.timeout
+        self.proc.stdin.write(
+            f"{{ {script}\n}} < /dev/null 2>&1; printf '\\n%s %d\\n' '{SENTINEL}' $?\n"
+        )
+        self.proc.stdin.flush()
+
+        deadline = time.monotonic() + timeout
+        lines = []
+        while True:
+            try:
+                line = self.lines.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                self.proc.kill()
+                raise Exception(f"HDFS shell command timed out after {timeout}s: {script}")
+            if line is None:
+                raise Exception("HDFS shell session ended unexpectedly")
+            if line.startswith(SENTINEL):
+                # Drop the newline printed ahead of the sentinel
+                return int(line.split()[-1]), ''.join(lines)[:-1]
+            lines.append(line)
+
+    def dfs(self, *args):
+        """Run 'hdfs dfs <args>', raising with its output if it fails"""
+        code, output = self.run('hdfs dfs ' + shlex.join(args))
+        if code != 0:
+            raise Exception(f"hdfs dfs {args[0]} failed: {output}")
+        return output
+
+    def close(self):
+        """End the session"""
+        if self.proc.poll() is None:
+            self.proc.stdin.close()
+        self.proc.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
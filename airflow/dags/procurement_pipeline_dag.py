@@ -14,8 +14,15 @@ from airflow import DAG
 from airflow.operators.python import PythonOperator
 from airflow.operators.bash import BashOperator
 from datetime import datetime, timedelta
-import subprocess
+from contextlib import contextmanager
+import prestodb
+import shlex
 import json
+import csv
+import os
+
+from hdfs_client import HdfsShell
+from raw_tables import ORDERS_RAW_DDL, STOCK_RAW_DDL
 
 # Default arguments
 default_args = {
@@ -38,97 +45,291 @@ dag = DAG(
     tags=['procurement', 'batch', 'supplier-orders'],
 )
 
+# Airflow pools (created by airflow-init in docker-compose.yml)
+PRESTO_POOL = 'presto_pool'
+HDFS_POOL = 'hdfs_pool'
+
+# Exports of at least one HDFS block are uploaded as parallel parts
+PARALLEL_UPLOAD_MIN_BYTES = 128 * 1024 * 1024
+HDFS_UPLOAD_PARTS = 4
+
+# Raw landing directories, one sub-directory per date
+RAW_DATA_DIRS = {
+    'orders': '/procurement/raw/orders',
+    'stock': '/procurement/raw/stock',
+}
+
+# Hive partition key of each raw source's date directories
+RAW_PARTITION_KEYS = {
+    'orders': 'order_date',
+    'stock': 'snapshot_date',
+}
+
+# Presto coordinator (reached over HTTP instead of docker exec presto-cli)
+PRESTO_HOST = os.getenv('PRESTO_HOST', 'presto')
+PRESTO_PORT = int(os.getenv('PRESTO_PORT', 8080))
+EXPORT_BATCH_ROWS = 10000
+
+@contextmanager
+def _presto_cursor():
+    """Context manager yielding a cursor on one persistent Presto connection"""
+    conn = prestodb.dbapi.connect(
+        host=PRESTO_HOST,
+        port=PRESTO_PORT,
+        user='airflow',
+        catalog='hive',
+        schema='default',
+    )
+    try:
+        yield conn.cursor()
+    finally:
+        conn.close()
+
+def _execute(cursor, query):
+    """Run a statement and drain its result so it runs to completion"""
+    cursor.execute(query)
+    return cursor.fetchall()
+
 def initialize_presto_schema(**context):
-    """Task 1: Initialize Presto Hive schema (idempotent)"""
+    """Task 1: Initialize Presto Hive schema and date-partitioned tables (idempotent)"""
     print("Initializing Presto Hive schema...")
     
-    # Create default schema if not exists
-    cmd = ['docker', 'exec', 'presto', 'presto-cli', '--execute', 
-           'CREATE SCHEMA IF NOT EXISTS hive.default']
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    
-    if result.returncode != 0:
-        raise Exception(f"Failed to create Hive schema: {result.stderr}")
-    
-    # Verify schema exists
-    cmd_verify = ['docker', 'exec', 'presto', 'presto-cli', '--execute', 
-                  'SHOW SCHEMAS FROM hive']
-    result = subprocess.run(cmd_verify, capture_output=True, text=True)
-    
-    if 'default' not in result.stdout:
-        raise Exception("Hive default schema not found after creation")
+    with _presto_cursor() as cursor:
+        # Create default schema if not exists
+        _execute(cursor, 'CREATE SCHEMA IF NOT EXISTS hive.default')
+        
+        # Verify schema exists
+        schemas = [row[0] for row in _execute(cursor, 'SHOW SCHEMAS FROM hive')]
+        if 'default' not in schemas:
+            raise Exception("Hive default schema not found after creation")
+        
+        # Raw JSON externals over the landing directories (see raw_tables.py)
+        _execute(cursor, ORDERS_RAW_DDL)
+        _execute(cursor, STOCK_RAW_DDL)
+        
+        # Columnar copies that every query reads, so aggregations only
+        # decode the columns they touch instead of parsing JSON text
+        _execute(cursor, """
+            CREATE TABLE IF NOT EXISTS hive.default.orders (
+                order_id VARCHAR,
+                pos_store_id VARCHAR,
+                sku VARCHAR,
+                quantity INTEGER,
+                unit_price DOUBLE,
+                order_date VARCHAR
+            )
+            WITH (format = 'PARQUET', partitioned_by = ARRAY['order_date'])
+        """)
+        _execute(cursor, """
+            CREATE TABLE IF NOT EXISTS hive.default.stock (
+                warehouse_code VARCHAR,
+                sku VARCHAR,
+                available_stock INTEGER,
+                reserved_stock INTEGER,
+                snapshot_date VARCHAR
+            )
+            WITH (format = 'PARQUET', partitioned_by = ARRAY['snapshot_date'])
+        """)
+        
+        # Per-SKU aggregates, partitioned the same way as their sources
+        _execute(cursor, """
+            CREATE TABLE IF NOT EXISTS hive.default.orders_by_sku (
+                sku VARCHAR,
+                total_quantity BIGINT,
+                store_count BIGINT,
+                avg_quantity DOUBLE,
+                order_date VARCHAR
+            )
+            WITH (partitioned_by = ARRAY['order_date'])
+        """)
+        _execute(cursor, """
+            CREATE TABLE IF NOT EXISTS hive.default.stock_by_sku (
+                sku VARCHAR,
+                total_available BIGINT,
+                total_reserved BIGINT,
+                snapshot_date VARCHAR
+            )
+            WITH (partitioned_by = ARRAY['snapshot_date'])
+        """)
     
     print("✓ Presto Hive schema initialized")
     return True
 
-def check_data_availability(**context):
-    """Task 2: Check if POS files and stock snapshots are available"""
+def list_raw_data(**context):
+    """Task 2: List available raw order/stock dates with a single HDFS call"""
+    with HdfsShell() as hdfs:
+        code, output = hdfs.run('hdfs dfs -ls ' + shlex.join(RAW_DATA_DIRS.values()))
+    
+    # A missing directory makes ls fail, but the other listings are still printed
+    available = {source: [] for source in RAW_DATA_DIRS}
+    sources = {hdfs_dir: source for source, hdfs_dir in RAW_DATA_DIRS.items()}
+    for line in output.split('\n'):
+        parts = line.split()
+        if not parts:
+            continue
+        parent, _, name = parts[-1].rpartition('/')
+        source = sources.get(parent)
+        if source is None:
+            continue
+        # Only <partition_key>=YYYY-MM-DD directories are registered as partitions
+        prefix = f"{RAW_PARTITION_KEYS[source]}="
+        if name.startswith(prefix):
+            available[source].append(name[len(prefix):])
+    
+    # Nothing listed at all means HDFS itself failed, not just a missing directory
+    if code != 0 and not any(available.values()):
+        raise Exception(f"HDFS listing of raw data failed: {output}")
+    
+    print(f"✓ Listed raw data: {len(available['orders'])} order dates, "
+          f"{len(available['stock'])} stock dates")
+    return available
+
+def _check_available(context, source, label):
+    """Raise if the listing from list_raw_data has no data for the run date"""
     execution_date = context['ds']
+    available = context['ti'].xcom_pull(task_ids='list_raw_data')
     
-    # Check HDFS for orders
-    cmd_orders = f"docker exec hadoop_client hdfs dfs -ls /procurement/raw/orders/{execution_date}"
-    result = subprocess.run(cmd_orders.split(), capture_output=True, text=True)
-    
-    if result.returncode != 0:
-        raise Exception(f"Orders data not found for {execution_date}")
-    
-    # Check HDFS for stock
-    cmd_stock = f"docker exec hadoop_client hdfs dfs -ls /procurement/raw/stock/{execution_date}"
-    result = subprocess.run(cmd_stock.split(), capture_output=True, text=True)
-    
-    if result.returncode != 0:
-        raise Exception(f"Stock data not found for {execution_date}")
+    if execution_date not in available[source]:
+        raise Exception(f"{label} data not found for {execution_date}")
     
-    print(f"✓ Data availability verified for {execution_date}")
+    print(f"✓ {label} availability verified for {execution_date}")
     return True
 
-def create_hive_tables(**context):
-    """Task 3: Create/refresh Hive external tables"""
+def check_orders_availability(**context):
+    """Task 2a: Check if POS order files are available"""
+    return _check_available(context, 'orders', 'Orders')
+
+def check_stock_availability(**context):
+    """Task 2b: Check if stock snapshots are available"""
+    return _check_available(context, 'stock', 'Stock')
+
+def _drop_tables(cursor, *tables):
+    """Drop Hive tables if they exist, all over the same Presto session"""
+    for table in tables:
+        _execute(cursor, f'DROP TABLE IF EXISTS hive.default.{table}')
+
+def _recreate_table(cursor, table, create_query):
+    """Drop and re-create a Hive table"""
+    _drop_tables(cursor, table)
+    _execute(cursor, create_query)
+
+def add_orders_partition(**context):
+    """Task 3a: Register the day's orders partition, convert it to Parquet and aggregate it per SKU"""
     execution_date = context['ds']
     
-    queries = [
-        "DROP TABLE IF EXISTS hive.default.orders",
-        "DROP TABLE IF EXISTS hive.default.stock",
-        f"""
-        CREATE TABLE hive.default.orders (
-            order_id VARCHAR,
-            pos_store_id VARCHAR,
-            sku VARCHAR,
-            quantity INTEGER,
-            order_date VARCHAR,
-            unit_price DOUBLE
-        )
-        WITH (
-            external_location = 'hdfs://namenode:9000/procurement/raw/orders/{execution_date}',
-            format = 'JSON'
-        )
-        """,
-        f"""
-        CREATE TABLE hive.default.stock (
-            warehouse_code VARCHAR,
-            sku VARCHAR,
-            available_stock INTEGER,
-            reserved_stock INTEGER,
-            snapshot_date VARCHAR
-        )
-        WITH (
-            external_location = 'hdfs://namenode:9000/procurement/raw/stock/{execution_date}',
-            format = 'JSON'
-        )
-        """
-    ]
-    
-    for query in queries:
-        cmd = ['docker', 'exec', 'presto', 'presto-cli', '--execute', query]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode != 0 and "DROP TABLE" not in query:
-            raise Exception(f"Failed to create tables: {result.stderr}")
+    with _presto_cursor() as cursor:
+        _execute(cursor, "CALL hive.system.sync_partition_metadata('default', 'orders_raw', 'ADD')")
+        
+        # Deleting whole partitions first keeps re-runs idempotent
+        _execute(cursor, f"DELETE FROM hive.default.orders WHERE order_date = '{execution_date}'")
+        _execute(cursor, f"""
+            INSERT INTO hive.default.orders
+            SELECT order_id, pos_store_id, sku, quantity, unit_price, order_date
+            FROM hive.default.orders_raw
+            WHERE order_date = '{execution_date}'
+        """)
+        
+        # Materialize per-SKU order aggregates once; downstream tasks read these
+        # instead of re-scanning and re-grouping the orders
+        _execute(cursor, f"DELETE FROM hive.default.orders_by_sku WHERE order_date = '{execution_date}'")
+        _execute(cursor, f"""
+            INSERT INTO hive.default.orders_by_sku
+            SELECT 
+                sku,
+                SUM(quantity) as total_quantity,
+                COUNT(DISTINCT pos_store_id) as store_count,
+                AVG(quantity) as avg_quantity,
+                order_date
+            FROM hive.default.orders
+            WHERE order_date = '{execution_date}'
+            GROUP BY sku, order_date
+        """)
+    
+    print(f"✓ Orders partition {execution_date} loaded and aggregated")
+    return True
+
+def add_stock_partition(**context):
+    """Task 3b: Register the day's stock partition, convert it to Parquet and aggregate it per SKU"""
+    execution_date = context['ds']
     
-    print("✓ Hive tables created/refreshed")
+    with _presto_cursor() as cursor:
+        _execute(cursor, "CALL hive.system.sync_partition_metadata('default', 'stock_raw', 'ADD')")
+        
+        _execute(cursor, f"DELETE FROM hive.default.stock WHERE snapshot_date = '{execution_date}'")
+        _execute(cursor, f"""
+            INSERT INTO hive.default.stock
+            SELECT warehouse_code, sku, available_stock, reserved_stock, snapshot_date
+            FROM hive.default.stock_raw
+            WHERE snapshot_date = '{execution_date}'
+        """)
+        
+        # Per-SKU stock aggregates (summed across warehouses)
+        _execute(cursor, f"DELETE FROM hive.default.stock_by_sku WHERE snapshot_date = '{execution_date}'")
+        _execute(cursor, f"""
+            INSERT INTO hive.default.stock_by_sku
+            SELECT 
+                sku,
+                SUM(available_stock) as total_available,
+                SUM(reserved_stock) as total_reserved,
+                snapshot_date
+            FROM hive.default.stock
+            WHERE snapshot_date = '{execution_date}'
+            GROUP BY sku, snapshot_date
+        """)
+    
+    print(f"✓ Stock partition {execution_date} loaded and aggregated")
     return True
 
+def _export_query(cursor, query, local_path):
+    """Stream query results into a local CSV file in batches"""
+    cursor.execute(query)
+    # Quote every field, matching the presto-cli CSV format consumers expect
+    with open(local_path, 'w', newline='') as out:
+        writer = csv.writer(out, quoting=csv.QUOTE_ALL, lineterminator='\n')
+        rows = cursor.fetchmany(EXPORT_BATCH_ROWS)
+        while rows:
+            writer.writerows(rows)
+            rows = cursor.fetchmany(EXPORT_BATCH_ROWS)
+
+def _upload_to_hdfs(hdfs, local_path, hdfs_path):
+    """Upload a local file to HDFS, splitting large files into parallel parts
+    
+    /data is mounted at the same path in hadoop_client, so put reads the file
+    directly. Large files are put as byte ranges in parallel background jobs
+    and stitched together with a server-side 'hdfs dfs -concat'; the result
+    only replaces hdfs_path once every part has been uploaded and joined.
+    """
+    size = os.path.getsize(local_path)
+    if size < PARALLEL_UPLOAD_MIN_BYTES:
+        hdfs.dfs('-put', '-f', local_path, hdfs_path)
+        return
+    
+    part_size = -(-size // HDFS_UPLOAD_PARTS)
+    # Every range goes to a temp part; the rest are concatenated onto .part0
+    targets = [f"{hdfs_path}.part{i}" for i in range(HDFS_UPLOAD_PARTS)]
+    
+    jobs = [
+        f"tail -c +{i * part_size + 1} {shlex.quote(local_path)} | head -c {part_size} | "
+        f"hdfs dfs -put -f - {shlex.quote(target)} & pids=\"$pids $!\""
+        for i, target in enumerate(targets)
+    ]
+    script = "\n".join([
+        'pids=""',
+        *jobs,
+        'rc=0; for pid in $pids; do wait $pid || rc=1; done',
+        # hdfs dfs -mv won't overwrite, so the previous export is removed just before the move
+        f"[ $rc -eq 0 ] && hdfs dfs -concat {shlex.join(targets)} && "
+        f"hdfs dfs -rm -f {shlex.quote(hdfs_path)} && "
+        f"hdfs dfs -mv {shlex.quote(targets[0])} {shlex.quote(hdfs_path)} || "
+        f"{{ hdfs dfs -rm -f {shlex.join(targets)}; false; }}",
+    ])
+    code, output = hdfs.run(script)
+    if code != 0:
+        raise Exception(f"HDFS parallel upload to {hdfs_path} failed: {output}")
+
 def validate_data_quality(**context):
     """Task 4: Validate data quality and detect anomalies"""
+    execution_date = context['ds']
     exceptions = []
     
     # Check for missing supplier mappings
@@ -138,28 +339,26 @@ def validate_data_quality(**context):
         LEFT JOIN postgresql.public.supplier_products sp ON p.product_id = sp.product_id
         WHERE sp.supplier_id IS NULL AND p.is_active = TRUE
     """
-    cmd = ['docker', 'exec', 'presto', 'presto-cli', '--execute', query]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    
-    if '"0"' not in result.stdout:
-        exceptions.append("WARNING: Products without supplier mappings detected")
-    
-    # Check for abnormal demand spikes
-    query = """
-        SELECT sku, SUM(quantity) as total_demand
-        FROM hive.default.orders
-        GROUP BY sku
-        HAVING SUM(quantity) > 1000
-    """
-    cmd = ['docker', 'exec', 'presto', 'presto-cli', '--execute', query]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    
-    if len(result.stdout.strip().split('\n')) > 1:
-        exceptions.append("INFO: Abnormal demand spike detected for some SKUs")
+    with _presto_cursor() as cursor:
+        cursor.execute(query)
+        (unmapped_skus,) = cursor.fetchone()
+        
+        if unmapped_skus > 0:
+            exceptions.append("WARNING: Products without supplier mappings detected")
+        
+        # Check for abnormal demand spikes (one matching SKU is enough)
+        query = f"""
+            SELECT sku, total_quantity as total_demand
+            FROM hive.default.orders_by_sku
+            WHERE order_date = '{execution_date}' AND total_quantity > 1000
+            LIMIT 1
+        """
+        cursor.execute(query)
+        if cursor.fetchone() is not None:
+            exceptions.append("INFO: Abnormal demand spike detected for some SKUs")
     
     # Log exceptions
     if exceptions:
-        execution_date = context['ds']
         log_path = f"/logs/exceptions/{execution_date}_exceptions.log"
         # Save exceptions (simplified - would write to HDFS in production)
         print(f"⚠ Exceptions detected:\n" + "\n".join(exceptions))
@@ -171,46 +370,19 @@ def validate_data_quality(**context):
 def calculate_net_demand(**context):
     """Task 5: Calculate net demand per SKU"""
     execution_date = context['ds']
-    import tempfile
-    import os
+    
+    os.makedirs("/data/processed/aggregated_orders", exist_ok=True)
+    os.makedirs("/data/processed/net_demand", exist_ok=True)
     
     # Step 1: Export aggregated orders to HDFS
-    agg_query = """
-        SELECT 
-            sku,
-            SUM(quantity) as total_quantity,
-            COUNT(DISTINCT pos_store_id) as store_count,
-            AVG(quantity) as avg_quantity
-        FROM hive.default.orders
-        GROUP BY sku
+    agg_query = f"""
+        SELECT sku, total_quantity, store_count, avg_quantity
+        FROM hive.default.orders_by_sku
+        WHERE order_date = '{execution_date}'
     """
     
-    result = subprocess.run(
-        ['docker', 'exec', 'presto', 'presto-cli', '--output-format', 'CSV', '--execute', agg_query],
-        capture_output=True, text=True
-    )
-    
-    if result.returncode == 0:
-        # Save to temp file
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv') as f:
-            f.write(result.stdout)
-            temp_path = f.name
-        
-        # Ensure HDFS directory exists
-        subprocess.run(['docker', 'exec', 'hadoop_client', 'hdfs', 'dfs', '-mkdir', '-p',
-                       '/procurement/processed/aggregated_orders'], capture_output=True)
-        
-        # Upload to HDFS
-        hdfs_path = f"/procurement/processed/aggregated_orders/{execution_date}_aggregated_orders.csv"
-        subprocess.run(
-            ['docker', 'exec', '-i', 'hadoop_client', 'hdfs', 'dfs', '-put', '-f', '/dev/stdin', hdfs_path],
-            stdin=open(temp_path, 'rb'), capture_output=True
-        )
-        os.unlink(temp_path)
-        print(f"✓ Aggregated orders saved to HDFS: {hdfs_path}")
-    
     # Step 2: Calculate net demand
-    query = """
+    query = f"""
         CREATE TABLE hive.default.net_demand AS
         SELECT 
             p.sku,
@@ -225,56 +397,48 @@ def calculate_net_demand(**context):
                 0
             ) as net_demand,
             r.case_size,
-            r.min_order_quantity
+            r.min_order_quantity,
+            -- Net demand rounded up to whole cases
+            CAST(CEIL(GREATEST(
+                COALESCE(o.total_quantity, 0) + r.safety_stock - 
+                (COALESCE(s.total_available, 0) - COALESCE(s.total_reserved, 0)),
+                0
+            ) * 1.0 / r.case_size) * r.case_size AS INTEGER) as order_quantity
         FROM postgresql.public.products p
         JOIN postgresql.public.replenishment_rules r ON p.product_id = r.product_id
-        LEFT JOIN (
-            SELECT sku, SUM(quantity) as total_quantity
-            FROM hive.default.orders GROUP BY sku
-        ) o ON p.sku = o.sku
-        LEFT JOIN (
-            SELECT sku, 
-                   SUM(available_stock) as total_available,
-                   SUM(reserved_stock) as total_reserved
-            FROM hive.default.stock GROUP BY sku
-        ) s ON p.sku = s.sku
+        LEFT JOIN hive.default.orders_by_sku o
+            ON p.sku = o.sku AND o.order_date = '{execution_date}'
+        LEFT JOIN hive.default.stock_by_sku s
+            ON p.sku = s.sku AND s.snapshot_date = '{execution_date}'
         WHERE p.is_active = TRUE
     """
     
-    # Drop existing table
-    subprocess.run([
-        'docker', 'exec', 'presto', 'presto-cli', '--execute',
-        'DROP TABLE IF EXISTS hive.default.net_demand'
-    ], capture_output=True)
-    
-    # Create net demand table
-    cmd = ['docker', 'exec', 'presto', 'presto-cli', '--execute', query]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    
-    if result.returncode != 0:
-        raise Exception(f"Net demand calculation failed: {result.stderr}")
-    
     # Step 3: Export net demand to HDFS
     export_query = "SELECT * FROM hive.default.net_demand"
-    result = subprocess.run(
-        ['docker', 'exec', 'presto', 'presto-cli', '--output-format', 'CSV', '--execute', export_query],
-        capture_output=True, text=True
-    )
     
-    if result.returncode == 0:
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv') as f:
-            f.write(result.stdout)
-            temp_path = f.name
+    agg_file = f"{execution_date}_aggregated_orders.csv"
+    agg_local_path = f"/data/processed/aggregated_orders/{agg_file}"
+    demand_file = f"{execution_date}_net_demand.csv"
+    demand_local_path = f"/data/processed/net_demand/{demand_file}"
+    
+    with _presto_cursor() as cursor:
+        _export_query(cursor, agg_query, agg_local_path)
         
-        subprocess.run(['docker', 'exec', 'hadoop_client', 'hdfs', 'dfs', '-mkdir', '-p',
-                       '/procurement/processed/net_demand'], capture_output=True)
+        # Drop existing table and create net demand table
+        _recreate_table(cursor, 'net_demand', query)
         
-        hdfs_path = f"/procurement/processed/net_demand/{execution_date}_net_demand.csv"
-        subprocess.run(
-            ['docker', 'exec', '-i', 'hadoop_client', 'hdfs', 'dfs', '-put', '-f', '/dev/stdin', hdfs_path],
-            stdin=open(temp_path, 'rb'), capture_output=True
-        )
-        os.unlink(temp_path)
+        _export_query(cursor, export_query, demand_local_path)
+    
+    with HdfsShell() as hdfs:
+        # Ensure HDFS directories exist
+        hdfs.dfs('-mkdir', '-p', '/procurement/processed/aggregated_orders', '/procurement/processed/net_demand')
+        
+        hdfs_path = f"/procurement/processed/aggregated_orders/{agg_file}"
+        _upload_to_hdfs(hdfs, agg_local_path, hdfs_path)
+        print(f"✓ Aggregated orders saved to HDFS: {hdfs_path}")
+        
+        hdfs_path = f"/procurement/processed/net_demand/{demand_file}"
+        _upload_to_hdfs(hdfs, demand_local_path, hdfs_path)
         print(f"✓ Net demand saved to HDFS: {hdfs_path}")
     
     print("✓ Net demand calculated")
@@ -292,7 +456,7 @@ def generate_supplier_orders(**context):
             nd.product_name,
             nd.net_demand,
             nd.case_size,
-            CAST(CEIL(nd.net_demand * 1.0 / nd.case_size) * nd.case_size AS INTEGER) as order_quantity
+            nd.order_quantity
         FROM hive.default.net_demand nd
         JOIN postgresql.public.products p ON nd.sku = p.sku
         JOIN postgresql.public.supplier_products sp ON p.product_id = sp.product_id
@@ -301,32 +465,20 @@ def generate_supplier_orders(**context):
         ORDER BY s.supplier_code, nd.sku
     """
     
-    cmd = ['docker', 'exec', 'presto', 'presto-cli', '--output-format', 'CSV', '--execute', query]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    
-    if result.returncode != 0:
-        raise Exception(f"Supplier order generation failed: {result.stderr}")
-    
     # Save to local /data directory
-    import os
-    import tempfile
     output_dir = "/data/output/supplier_orders"
     os.makedirs(output_dir, exist_ok=True)
     
     output_file = f"supplier_orders_{execution_date.replace('-', '')}.csv"
     local_path = f"{output_dir}/{output_file}"
-    with open(local_path, 'w') as f:
-        f.write(result.stdout)
+    with _presto_cursor() as cursor:
+        _export_query(cursor, query, local_path)
     
     # Also save to HDFS /output/supplier_orders/
-    subprocess.run(['docker', 'exec', 'hadoop_client', 'hdfs', 'dfs', '-mkdir', '-p',
-                   '/procurement/output/supplier_orders'], capture_output=True)
-    
     hdfs_path = f"/procurement/output/supplier_orders/{output_file}"
-    subprocess.run(
-        ['docker', 'exec', '-i', 'hadoop_client', 'hdfs', 'dfs', '-put', '-f', '/dev/stdin', hdfs_path],
-        stdin=open(local_path, 'rb'), capture_output=True
-    )
+    with HdfsShell() as hdfs:
+        hdfs.dfs('-mkdir', '-p', '/procurement/output/supplier_orders')
+        _upload_to_hdfs(hdfs, local_path, hdfs_path)
     
     print(f"✓ Supplier orders generated: {output_file}")
     print(f"✓ Saved locally: {local_path}")
@@ -335,55 +487,89 @@ def generate_supplier_orders(**context):
 
 def cleanup_temp_tables(**context):
     """Task 7: Cleanup temporary tables"""
-    subprocess.run([
-        'docker', 'exec', 'presto', 'presto-cli', '--execute',
-        'DROP TABLE IF EXISTS hive.default.net_demand'
-    ])
+    # The partitioned orders/stock tables and aggregates are permanent
+    with _presto_cursor() as cursor:
+        _drop_tables(cursor, 'net_demand')
     print("✓ Temporary tables cleaned up")
     return True
 
 # Define tasks
+# Presto client sessions and HDFS shell sessions are throttled through
+# separate pools so independent branches can overlap without flooding
+# either service.
 task_init_schema = PythonOperator(
     task_id='initialize_presto_schema',
     python_callable=initialize_presto_schema,
+    pool=PRESTO_POOL,
+    dag=dag,
+)
+
+task_list_raw = PythonOperator(
+    task_id='list_raw_data',
+    python_callable=list_raw_data,
+    pool=HDFS_POOL,
+    dag=dag,
+)
+
+task_check_orders = PythonOperator(
+    task_id='check_orders_availability',
+    python_callable=check_orders_availability,
+    dag=dag,
+)
+
+task_check_stock = PythonOperator(
+    task_id='check_stock_availability',
+    python_callable=check_stock_availability,
     dag=dag,
 )
 
-task_check_data = PythonOperator(
-    task_id='check_data_availability',
-    python_callable=check_data_availability,
+task_add_orders = PythonOperator(
+    task_id='add_orders_partition',
+    python_callable=add_orders_partition,
+    pool=PRESTO_POOL,
     dag=dag,
 )
 
-task_create_tables = PythonOperator(
-    task_id='create_hive_tables',
-    python_callable=create_hive_tables,
+task_add_stock = PythonOperator(
+    task_id='add_stock_partition',
+    python_callable=add_stock_partition,
+    pool=PRESTO_POOL,
     dag=dag,
 )
 
 task_validate_quality = PythonOperator(
     task_id='validate_data_quality',
     python_callable=validate_data_quality,
+    pool=PRESTO_POOL,
     dag=dag,
 )
 
 task_calculate_demand = PythonOperator(
     task_id='calculate_net_demand',
     python_callable=calculate_net_demand,
+    pool=PRESTO_POOL,
     dag=dag,
 )
 
 task_generate_orders = PythonOperator(
     task_id='generate_supplier_orders',
     python_callable=generate_supplier_orders,
+    pool=PRESTO_POOL,
     dag=dag,
 )
 
 task_cleanup = PythonOperator(
     task_id='cleanup_temp_tables',
     python_callable=cleanup_temp_tables,
+    pool=PRESTO_POOL,
     dag=dag,
 )
 
 # Define task dependencies (pipeline flow)
-task_init_schema >> task_check_data >> task_create_tables >> task_validate_quality >> task_calculate_demand >> task_generate_orders >> task_cleanup
+# Schema init and the HDFS availability checks run in parallel; each partition
+# only waits for the tables and its own source data.
+task_init_schema >> [task_add_orders, task_add_stock]
+task_list_raw >> [task_check_orders, task_check_stock]
+task_check_orders >> task_add_orders
+task_check_stock >> task_add_stock
+[task_add_orders, task_add_stock] >> task_validate_quality >> task_calculate_demand >> task_generate_orders >> task_cleanup
@@ -0,0 +1,37 @@
+"""
+Raw landing tables
+JSON external tables over the HDFS landing directories, shared by the DAG
+and scripts/analyze_data.py (kept free of Airflow imports for that reason).
+Each day is a partition directory (order_date=YYYY-MM-DD / snapshot_date=YYYY-MM-DD)
+"""
+
+ORDERS_RAW_DDL = """
+    CREATE TABLE IF NOT EXISTS hive.default.orders_raw (
+        order_id VARCHAR,
+        pos_store_id VARCHAR,
+        sku VARCHAR,
+        quantity INTEGER,
+        unit_price DOUBLE,
+        order_date VARCHAR
+    )
+    WITH (
+        external_location = 'hdfs://namenode:9000/procurement/raw/orders',
+        format = 'JSON',
+        partitioned_by = ARRAY['order_date']
+    )
+"""
+
+STOCK_RAW_DDL = """
+    CREATE TABLE IF NOT EXISTS hive.default.stock_raw (
+        warehouse_code VARCHAR,
+        sku VARCHAR,
+        available_stock INTEGER,
+        reserved_stock INTEGER,
+        snapshot_date VARCHAR
+    )
+    WITH (
+        external_location = 'hdfs://namenode:9000/procurement/raw/stock',
+        format = 'JSON',
+        partitioned_by = ARRAY['snapshot_date']
+    )
+"""
@@ -1,6 +1,9 @@
 """Configuration management for the procurement pipeline."""
 
 import os
+import sys
+import logging
+import functools
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -42,8 +45,12 @@ PIPELINE_CONFIG = {
     "batch_execution_time": os.getenv("BATCH_EXECUTION_TIME", "22:00"),
 }
 
+# .gitkeep placeholders are a source-control artifact, only written in dev
+PROCUREMENT_ENV = os.getenv("PROCUREMENT_ENV", "production")
+
+@functools.lru_cache(maxsize=1)
 def ensure_directories():
-    """Create all necessary directories if they don't exist."""
+    """Create all necessary directories if they don't exist (once per process)."""
     directories = [
         RAW_ORDERS_DIR,
         RAW_STOCK_DIR,
@@ -55,10 +62,34 @@ def ensure_directories():
     
     for directory in directories:
         directory.mkdir(parents=True, exist_ok=True)
-        # Create .gitkeep file
-        gitkeep = directory / ".gitkeep"
-        if not gitkeep.exists():
-            gitkeep.touch()
+        if PROCUREMENT_ENV == "dev":
+            # Create .gitkeep file
+            gitkeep = directory / ".gitkeep"
+            if not gitkeep.exists():
+                gitkeep.touch()
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """StreamHandler that leaves flushing to the stream, except for warnings and errors."""
+    
+    def emit(self, record):
+        try:
+            self.stream.write(self.format(record) + self.terminator)
+            if record.levelno >= logging.WARNING:
+                self.flush()
+        except Exception:
+            self.handleError(record)
+
+def configure_logging(verbose: bool = False):
+    """Send script logging to a block-buffered stdout as plain messages.
+    
+    print() shares the same stdout buffer, so log lines and prints stay in
+    order; everything is flushed when the buffer fills or the process exits.
+    """
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
+    handler = _BufferedStreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    logging.basicConfig(level=logging.DEBUG if verbose else logging.INFO, handlers=[handler])
 
 if __name__ == "__main__":
     ensure_directories()
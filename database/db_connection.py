@@ -1,9 +1,15 @@
 """Database connection and utility functions."""
 
 import psycopg2
-from psycopg2.extras import RealDictCursor
+from psycopg2 import sql
+from psycopg2.extras import RealDictCursor, execute_batch, execute_values
+from psycopg2.pool import ThreadedConnectionPool
 from contextlib import contextmanager
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable
+import threading
+import csv
+import io
+import re
 import sys
 from pathlib import Path
 
@@ -11,6 +17,27 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 from config.config import DB_CONFIG
 
+# Shared connection pool, created on first use
+POOL_MIN_CONNECTIONS = 1
+POOL_MAX_CONNECTIONS = 8
+_pool = None
+_pool_lock = threading.Lock()
+
+# Matches the single-placeholder form expected by execute_values
+_VALUES_PLACEHOLDER = re.compile(r"\bVALUES\s+%s", re.IGNORECASE)
+
+
+def _get_pool() -> ThreadedConnectionPool:
+    """Return the process-wide connection pool, creating it if needed."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadedConnectionPool(
+                    POOL_MIN_CONNECTIONS, POOL_MAX_CONNECTIONS, **DB_CONFIG
+                )
+    return _pool
+
 
 class DatabaseConnection:
     """Manages PostgreSQL database connections."""
@@ -18,36 +45,123 @@ class DatabaseConnection:
     @staticmethod
     @contextmanager
     def get_connection():
-        """Context manager for database connections."""
-        conn = None
+        """Context manager for pooled database connections."""
+        pool = _get_pool()
+        conn = pool.getconn()
         try:
-            conn = psycopg2.connect(**DB_CONFIG)
             yield conn
             conn.commit()
         except Exception as e:
-            if conn:
+            if not conn.closed:
                 conn.rollback()
             raise e
         finally:
-            if conn:
-                conn.close()
+            # Discard connections that were closed underneath us
+            pool.putconn(conn, close=bool(conn.closed))
     
     @staticmethod
-    def execute_query(query: str, params: tuple = None, fetch: bool = False) -> List[Dict[str, Any]]:
-        """Execute a SQL query and optionally fetch results."""
+    @contextmanager
+    def session():
+        """Context manager yielding a cursor on one pooled connection.
+        
+        Everything run through the cursor shares one transaction, committed
+        when the block exits and rolled back on error.
+        """
         with DatabaseConnection.get_connection() as conn:
             with conn.cursor(cursor_factory=RealDictCursor) as cursor:
-                cursor.execute(query, params)
-                if fetch:
-                    return [dict(row) for row in cursor.fetchall()]
-                return []
+                yield cursor
     
     @staticmethod
-    def execute_many(query: str, data: List[tuple]):
-        """Execute a query with multiple parameter sets."""
-        with DatabaseConnection.get_connection() as conn:
-            with conn.cursor() as cursor:
-                cursor.executemany(query, data)
+    @contextmanager
+    def bulk_load_mode(cursor, tables: List[str]):
+        """Speed up large loads on a session cursor.
+        
+        Sets session_replication_role to replica, which skips triggers and
+        therefore foreign-key checks. Also drops the tables' non-unique
+        secondary indexes for the duration of the block. Unique indexes stay
+        because ON CONFLICT needs them. The dropped indexes are rebuilt from
+        their saved definitions and the role is restored on exit. This runs
+        inside the session's transaction, so the rebuild uses plain CREATE
+        INDEX rather than CONCURRENTLY.
+        """
+        # Names resolve through the search_path, like the loads themselves,
+        # so same-named tables in other schemas are left alone
+        cursor.execute(
+            """
+            SELECT i.indexrelid::regclass::text AS index_name,
+                   pg_get_indexdef(i.indexrelid) AS definition
+            FROM pg_index i
+            WHERE i.indrelid = ANY(%s::regclass[]) AND NOT i.indisunique AND NOT i.indisprimary
+            """,
+            (list(tables),),
+        )
+        indexes = cursor.fetchall()
+        
+        cursor.execute("SET session_replication_role = replica")
+        for index in indexes:
+            # regclass text is already quoted (and schema-qualified if needed)
+            cursor.execute(sql.SQL("DROP INDEX {}").format(sql.SQL(index['index_name'])))
+        
+        # On error nothing is restored here: the session rolls back, undoing
+        # the drops and the SET along with the load
+        yield cursor
+        
+        for index in indexes:
+            cursor.execute(index['definition'])
+        cursor.execute("SET session_replication_role = DEFAULT")
+    
+    @staticmethod
+    def execute_query(query: str, params: tuple = None, fetch: bool = False,
+                      cursor=None) -> List[Dict[str, Any]]:
+        """Execute a SQL query and optionally fetch results.
+        
+        Runs on the given session cursor, or on its own connection if None.
+        """
+        if cursor is None:
+            with DatabaseConnection.session() as cursor:
+                return DatabaseConnection.execute_query(query, params, fetch, cursor)
+        
+        cursor.execute(query, params)
+        if fetch:
+            return [dict(row) for row in cursor.fetchall()]
+        return []
+    
+    @staticmethod
+    def execute_many(query: str, data: List[tuple], page_size: int = 1000, cursor=None):
+        """Execute a query with multiple parameter sets in batched round trips.
+        
+        Queries written as ``VALUES %s`` are expanded into one multi-row
+        VALUES statement per page; other queries are sent with execute_batch.
+        Runs on the given session cursor, or on its own connection if None.
+        """
+        if cursor is None:
+            with DatabaseConnection.session() as cursor:
+                return DatabaseConnection.execute_many(query, data, page_size, cursor)
+        
+        if _VALUES_PLACEHOLDER.search(query):
+            execute_values(cursor, query, data, page_size=page_size)
+        else:
+            execute_batch(cursor, query, data, page_size=page_size)
+    
+    @staticmethod
+    def bulk_copy(table: str, columns: List[str], rows: Iterable[tuple], cursor=None):
+        """Load rows into a table with COPY ... FROM STDIN (CSV format).
+        
+        Runs on the given session cursor, or on its own connection if None.
+        """
+        if cursor is None:
+            with DatabaseConnection.session() as cursor:
+                return DatabaseConnection.bulk_copy(table, columns, rows, cursor)
+        
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        
+        query = sql.SQL("COPY {} ({}) FROM STDIN WITH (FORMAT csv)").format(
+            sql.Identifier(table),
+            sql.SQL(", ").join(map(sql.Identifier, columns)),
+        )
+        cursor.copy_expert(query.as_string(cursor.connection), buffer)
     
     @staticmethod
     def execute_script(sql_file_path: str):
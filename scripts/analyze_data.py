@@ -6,36 +6,78 @@ Run locally to get quick overview of PostgreSQL master data and HDFS data via Pr
 import sys
 from pathlib import Path
 import subprocess
+import csv
+import functools
+import io
+import itertools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
 from database.db_connection import DatabaseConnection
 
+# Raw table DDL shared with the DAG, so the analyzer also works before the
+# DAG has run once
+sys.path.append(str(Path(__file__).parent.parent / "airflow" / "dags"))
+from raw_tables import ORDERS_RAW_DDL, STOCK_RAW_DDL
+
+# Summary column -> master data table
+MASTER_TABLES = {
+    "products": "products",
+    "suppliers": "suppliers",
+    "warehouses": "warehouses",
+    "rules": "replenishment_rules",
+}
+
+@functools.lru_cache(maxsize=None)
+def list_hdfs_dates(hdfs_dir):
+    """List the dates partitioned under an HDFS directory in one call.
+    
+    Returns None if the directory cannot be listed. Cached so repeated
+    lookups in the same run do not hit the NameNode again.
+    """
+    cmd = ['docker', 'exec', 'hadoop_client', 'hdfs', 'dfs', '-ls', hdfs_dir]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    
+    if result.returncode != 0:
+        return None
+    
+    dates = []
+    for line in result.stdout.split('\n'):
+        if f'{hdfs_dir}/' in line:
+            # Partition directories are named <partition_key>=YYYY-MM-DD
+            date = line.split('/')[-1].strip().split('=', 1)[-1]
+            if date and len(date) == 10:
+                dates.append(date)
+    return tuple(dates)
+
 
 class DataAnalyzer:
     """Quick data overview analyzer"""
     
-    def __init__(self):
+    def __init__(self, exact_counts=False):
         self.separator = "=" * 70
+        self.exact_counts = exact_counts
         
-    def print_header(self, title):
+    def print_header(self, title, out=None):
         """Print formatted section header"""
-        print(f"\n{self.separator}")
-        print(f"  {title}")
-        print(self.separator)
+        print(f"\n{self.separator}", file=out)
+        print(f"  {title}", file=out)
+        print(self.separator, file=out)
     
-    def run_presto_query(self, query):
-        """Execute Presto query and return results"""
+    def run_presto_query(self, query, out=None):
+        """Execute Presto query and return results (None on failure, after reporting it)"""
         cmd = ['docker', 'exec', 'presto', 'presto-cli', '--output-format', 'CSV', '--execute', query]
         result = subprocess.run(cmd, capture_output=True, text=True)
         
         if result.returncode != 0:
+            print(f"  ❌ Presto query failed: {result.stderr.strip()}", file=out)
             return None
         
         return result.stdout.strip()
     
-    def run_postgres_query(self, query):
+    def run_postgres_query(self, query, out=None):
         """Execute PostgreSQL query and return results"""
         try:
             results = DatabaseConnection.execute_query(query, fetch=True)
@@ -43,146 +85,163 @@ class DataAnalyzer:
             if not results:
                 return None
             
-            # Format as CSV
+            # Format as CSV (quoted where needed, so embedded commas survive)
             columns = list(results[0].keys())
-            output = [",".join(columns)]
+            output = io.StringIO()
+            writer = csv.writer(output, lineterminator='\n')
+            writer.writerow(columns)
             for row in results:
-                output.append(",".join(str(row[col]) for col in columns))
+                writer.writerow(row[col] for col in columns)
             
-            return "\n".join(output)
+            return output.getvalue()
         except Exception as e:
-            print(f"  ❌ Query failed: {e}")
+            print(f"  ❌ Query failed: {e}", file=out)
             return None
     
-    def format_csv_output(self, csv_data, max_rows=10):
+    def format_csv_output(self, csv_data, max_rows=10, out=None):
         """Format CSV data into readable table"""
         if not csv_data:
-            print("  No data")
+            print("  No data", file=out)
             return
         
-        lines = csv_data.strip().split('\n')
-        if len(lines) == 0:
+        # Parse only the header, the rows that will be displayed and one
+        # more to tell whether the output was truncated
+        reader = csv.reader(io.StringIO(csv_data.strip()))
+        header = next(reader, None)
+        if header is None:
             return
-        
-        # Parse CSV
-        rows = [line.split(',') for line in lines]
+        data_rows = list(itertools.islice(reader, max_rows + 1))
+        has_more = len(data_rows) > max_rows
+        data_rows = data_rows[:max_rows]
         
         # Calculate column widths
-        col_widths = [max(len(str(row[i])) for row in rows) for i in range(len(rows[0]))]
+        col_widths = [len(col) for col in header]
+        for row in data_rows:
+            for i, value in enumerate(row[:len(col_widths)]):
+                col_widths[i] = max(col_widths[i], len(value))
         
         # Print header
-        header = rows[0]
-        print("\n  " + " | ".join(header[i].ljust(col_widths[i]) for i in range(len(header))))
-        print("  " + "-+-".join("-" * col_widths[i] for i in range(len(header))))
+        print("\n  " + " | ".join(header[i].ljust(col_widths[i]) for i in range(len(header))), file=out)
+        print("  " + "-+-".join("-" * col_widths[i] for i in range(len(header))), file=out)
         
         # Print rows (limit to max_rows)
-        data_rows = rows[1:max_rows+1]
         for row in data_rows:
-            print("  " + " | ".join(str(row[i]).ljust(col_widths[i]) for i in range(len(row))))
+            print("  " + " | ".join(row[i].ljust(col_widths[i]) for i in range(min(len(row), len(header)))), file=out)
         
-        if len(rows) > max_rows + 1:
-            print(f"\n  ... and {len(rows) - max_rows - 1} more rows")
+        if has_more:
+            print("\n  ... more rows available", file=out)
     
-    def analyze_master_data(self):
+    def analyze_master_data(self, out=None):
         """Quick overview of PostgreSQL master data"""
-        self.print_header("MASTER DATA OVERVIEW (PostgreSQL)")
+        self.print_header("MASTER DATA OVERVIEW (PostgreSQL)", out=out)
         
-        # Simple counts
-        print("\n📊 Database Summary:")
-        query = """
-            SELECT 
-                (SELECT COUNT(*) FROM products) as products,
-                (SELECT COUNT(*) FROM suppliers) as suppliers,
-                (SELECT COUNT(*) FROM warehouses) as warehouses,
-                (SELECT COUNT(*) FROM replenishment_rules) as rules
+        # Row counts: planner estimates by default, exact counts on request
+        label = "" if self.exact_counts else " (approximate)"
+        print(f"\n📊 Database Summary{label}:", file=out)
+        try:
+            counts = self.count_master_rows()
+        except Exception as e:
+            print(f"  ❌ Query failed: {e}", file=out)
+            return
+        
+        result = ",".join(MASTER_TABLES) + "\n" + ",".join(str(counts[t]) for t in MASTER_TABLES.values())
+        self.format_csv_output(result, max_rows=1, out=out)
+    
+    def count_master_rows(self):
+        """Return row counts per master data table
+        
+        Uses pg_class.reltuples (O(1) planner estimate) unless exact counts
+        were requested. Tables without an estimate yet (never analyzed) and
+        exact mode fall back to COUNT(*), run concurrently on pooled
+        connections.
         """
-        result = self.run_postgres_query(query)
-        if result:
-            self.format_csv_output(result, max_rows=1)
+        tables = list(MASTER_TABLES.values())
+        counts = {}
+        
+        if not self.exact_counts:
+            estimates = DatabaseConnection.execute_query(
+                """
+                SELECT relname, reltuples::bigint AS approx_rows
+                FROM pg_class
+                WHERE oid = ANY(%s::regclass[])
+                """,
+                (tables,),
+                fetch=True,
+            )
+            # regclass resolves each name through the search_path (like the
+            # COUNT(*) fallback), so tables in other schemas are never matched
+            counts = {row['relname']: row['approx_rows'] for row in estimates if row['approx_rows'] >= 0}
+        
+        missing = [t for t in tables if t not in counts]
+        if missing:
+            with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+                counts.update(zip(missing, executor.map(self.count_rows, missing)))
+        
+        return counts
+    
+    @staticmethod
+    def count_rows(table):
+        """Exact row count for one master data table"""
+        result = DatabaseConnection.execute_query(f"SELECT COUNT(*) AS n FROM {table}", fetch=True)
+        return result[0]['n']
     
-    def analyze_hdfs_data(self):
+    def analyze_hdfs_data(self, out=None):
         """Quick overview of HDFS data via Presto"""
-        self.print_header("HDFS DATA OVERVIEW (via Presto)")
+        self.print_header("HDFS DATA OVERVIEW (via Presto)", out=out)
         
         # Check available dates
-        cmd = ['docker', 'exec', 'hadoop_client', 'hdfs', 'dfs', '-ls', '/procurement/raw/orders']
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        dates = list_hdfs_dates('/procurement/raw/orders')
         
-        if result.returncode != 0:
-            print("\n  ⚠ No data in HDFS yet")
+        if dates is None:
+            print("\n  ⚠ No data in HDFS yet", file=out)
             return
         
-        dates = []
-        for line in result.stdout.split('\n'):
-            if '/procurement/raw/orders/' in line:
-                date = line.split('/')[-1].strip()
-                if date and len(date) == 10:
-                    dates.append(date)
-        
         if not dates:
-            print("\n  ⚠ No data found in HDFS")
+            print("\n  ⚠ No data found in HDFS", file=out)
             return
         
-        latest_date = sorted(dates)[-1]
-        print(f"\n📅 Latest data date: {latest_date}")
-        print(f"   Available dates: {len(dates)}")
+        # ISO dates compare correctly as strings
+        latest_date = max(dates)
+        print(f"\n📅 Latest data date: {latest_date}", file=out)
+        print(f"   Available dates: {len(dates)}", file=out)
+        
+        # Make sure the raw tables exist, then register any newly uploaded
+        # partitions (all statements in one presto-cli session)
+        if self.run_presto_query(
+            f"{ORDERS_RAW_DDL}; {STOCK_RAW_DDL}; "
+            "CALL hive.system.sync_partition_metadata('default', 'orders_raw', 'ADD'); "
+            "CALL hive.system.sync_partition_metadata('default', 'stock_raw', 'ADD')",
+            out=out,
+        ) is None:
+            return
         
         # Quick orders count
         query = f"""
-            CREATE TABLE IF NOT EXISTS hive.default.temp_orders (
-                order_id VARCHAR,
-                pos_store_id VARCHAR,
-                sku VARCHAR,
-                quantity INTEGER,
-                order_date VARCHAR,
-                unit_price DOUBLE
-            )
-            WITH (
-                external_location = 'hdfs://namenode:9000/procurement/raw/orders/{latest_date}',
-                format = 'JSON'
-            )
-        """
-        self.run_presto_query(query)
-        
-        query = """
             SELECT 
                 COUNT(*) as order_items,
                 COUNT(DISTINCT sku) as unique_products,
                 SUM(quantity) as total_quantity
-            FROM hive.default.temp_orders
+            FROM hive.default.orders_raw
+            WHERE order_date = '{latest_date}'
         """
-        print("\n📦 Orders Summary:")
-        result = self.run_presto_query(query)
+        print("\n📦 Orders Summary:", file=out)
+        result = self.run_presto_query(query, out=out)
         if result:
-            self.format_csv_output(result, max_rows=1)
+            self.format_csv_output(result, max_rows=1, out=out)
         
         # Quick stock count
         query = f"""
-            CREATE TABLE IF NOT EXISTS hive.default.temp_stock (
-                warehouse_code VARCHAR,
-                sku VARCHAR,
-                available_stock INTEGER,
-                reserved_stock INTEGER,
-                snapshot_date VARCHAR
-            )
-            WITH (
-                external_location = 'hdfs://namenode:9000/procurement/raw/stock/{latest_date}',
-                format = 'JSON'
-            )
-        """
-        self.run_presto_query(query)
-        
-        query = """
             SELECT 
                 COUNT(*) as stock_records,
                 SUM(available_stock) as total_available,
                 SUM(reserved_stock) as total_reserved
-            FROM hive.default.temp_stock
+            FROM hive.default.stock_raw
+            WHERE snapshot_date = '{latest_date}'
         """
-        print("\n📊 Stock Summary:")
-        result = self.run_presto_query(query)
+        print("\n📊 Stock Summary:", file=out)
+        result = self.run_presto_query(query, out=out)
         if result:
-            self.format_csv_output(result, max_rows=1)
+            self.format_csv_output(result, max_rows=1, out=out)
         
         # Return latest date for combined analysis
         return latest_date
@@ -194,12 +253,13 @@ class DataAnalyzer:
         print("\n🔗 Top products ordered from HDFS...")
         
         # Get top ordered products from HDFS
-        query = """
+        query = f"""
             SELECT 
                 sku,
                 SUM(quantity) as total_ordered,
                 COUNT(DISTINCT pos_store_id) as stores
-            FROM hive.default.temp_orders
+            FROM hive.default.orders_raw
+            WHERE order_date = '{latest_date}'
             GROUP BY sku
             ORDER BY total_ordered DESC
             LIMIT 10
@@ -235,8 +295,19 @@ class DataAnalyzer:
         print("  " + datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
         print("=" * 70)
         
-        self.analyze_master_data()
-        latest_date = self.analyze_hdfs_data()
+        # PostgreSQL and HDFS/Presto are independent backends, so query them
+        # concurrently; each section prints into its own buffer to keep the
+        # report readable, then the buffers are flushed in order
+        master_out = io.StringIO()
+        hdfs_out = io.StringIO()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            master_future = executor.submit(self.analyze_master_data, out=master_out)
+            hdfs_future = executor.submit(self.analyze_hdfs_data, out=hdfs_out)
+            master_future.result()
+            latest_date = hdfs_future.result()
+        
+        print(master_out.getvalue(), end="")
+        print(hdfs_out.getvalue(), end="")
         
         # Run combined analysis if we have HDFS data
         if latest_date:
@@ -248,6 +319,13 @@ class DataAnalyzer:
 
 
 if __name__ == "__main__":
-    analyzer = DataAnalyzer()
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Quick overview of procurement pipeline data')
+    parser.add_argument('--exact-counts', action='store_true',
+                        help='Use exact COUNT(*) for master data instead of planner estimates')
+    args = parser.parse_args()
+    
+    analyzer = DataAnalyzer(exact_counts=args.exact_counts)
     analyzer.run_analysis()
 
@@ -0,0 +1,33 @@
+"""Lightweight fake value generators for bulk master data.
+
+Template-based stand-ins for the Faker providers whose realism doesn't
+matter here (company names, e-mails, phone numbers); Faker is kept for
+addresses.
+"""
+
+import random
+
+_COMPANY_ROOTS = (
+    "Acme", "Globex", "Initech", "Umbrella", "Stark", "Wayne", "Hooli",
+    "Vandelay", "Soylent", "Tyrell", "Cyberdyne", "Wonka", "Gringotts",
+    "Oceanic", "Monarch", "Atlas", "Summit", "Pioneer", "Evergreen", "Horizon",
+    "Silverline", "Bluebird", "Northwind", "Contoso", "Fabrikam",
+)
+_COMPANY_SUFFIXES = ("Inc", "LLC", "Ltd", "Group", "and Sons", "Co", "PLC", "Holdings")
+_EMAIL_NAMES = ("contact", "sales", "orders", "info", "supply", "procurement")
+_EMAIL_TLDS = ("com", "net", "org", "biz")
+
+
+def company() -> str:
+    """Company name, e.g. 'Globex Group'."""
+    return f"{random.choice(_COMPANY_ROOTS)} {random.choice(_COMPANY_SUFFIXES)}"
+
+
+def company_email() -> str:
+    """Company e-mail address, e.g. 'sales@globex.com'."""
+    return f"{random.choice(_EMAIL_NAMES)}@{random.choice(_COMPANY_ROOTS).lower()}.{random.choice(_EMAIL_TLDS)}"
+
+
+def phone_number() -> str:
+    """Phone number in '(XXX) XXX-XXXX' form."""
+    return f"({random.randint(200, 999)}) {random.randint(200, 999)}-{random.randint(0, 9999):04d}"
@@ -0,0 +1,33 @@
+"""Concurrent output file writes for the daily data generators."""
+
+import asyncio
+from pathlib import Path
+
+import aiofiles
+
+
+async def _write_file(path: Path, data: bytes):
+    """Write one file with a single awaited write."""
+    async with aiofiles.open(path, 'wb') as f:
+        await f.write(data)
+
+
+async def write_files_async(files: list[tuple[Path, bytes]]):
+    """Run every file write concurrently; await this from async code."""
+    await asyncio.gather(*(_write_file(path, data) for path, data in files))
+
+
+def write_files(files: list[tuple[Path, bytes]]):
+    """Write (path, data) pairs concurrently, overlapping the disk writes.
+
+    Inside an already running event loop (where asyncio.run is not allowed)
+    the files are written one after another instead.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        asyncio.run(write_files_async(files))
+        return
+
+    for path, data in files:
+        path.write_bytes(data)
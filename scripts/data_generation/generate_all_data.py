@@ -7,7 +7,8 @@ from datetime import date
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
-from config.config import ensure_directories, DATA_GEN_CONFIG
+from config.config import configure_logging, ensure_directories, DATA_GEN_CONFIG
+from database.db_connection import DatabaseConnection
 
 # Import generation modules
 from scripts.data_generation import (
@@ -19,6 +20,9 @@ from scripts.data_generation import (
     generate_stock
 )
 
+# Tables written by the master data generators
+MASTER_DATA_TABLES = ["suppliers", "warehouses", "products", "supplier_products", "replenishment_rules"]
+
 
 def generate_all_data(target_date=None):
     """Generate all test data in the correct order.
@@ -30,6 +34,10 @@ def generate_all_data(target_date=None):
     if target_date is None:
         target_date = date.today().strftime("%Y-%m-%d")
     
+    num_suppliers = DATA_GEN_CONFIG["num_suppliers"]
+    num_warehouses = DATA_GEN_CONFIG["num_warehouses"]
+    num_products = DATA_GEN_CONFIG["num_products"]
+    
     print("=" * 60)
     print("PROCUREMENT PIPELINE - DATA GENERATION")
     print("=" * 60)
@@ -38,33 +46,44 @@ def generate_all_data(target_date=None):
     print("\n1. Setting up directory structure...")
     ensure_directories()
     
-    # Generate master data
-    print("\n2. Generating suppliers...")
-    from scripts.data_generation.generate_suppliers import generate_suppliers, insert_suppliers_to_db
-    suppliers = generate_suppliers(DATA_GEN_CONFIG["num_suppliers"])
-    insert_suppliers_to_db(suppliers)
-    
-    print("\n3. Generating warehouses...")
-    from scripts.data_generation.generate_warehouses import generate_warehouses, insert_warehouses_to_db
-    warehouses = generate_warehouses(DATA_GEN_CONFIG["num_warehouses"])
-    insert_warehouses_to_db(warehouses)
+    # Generate master data on one connection, in a single transaction, with
+    # FK checks and secondary indexes suspended for the load
+    with DatabaseConnection.session() as cursor, \
+            DatabaseConnection.bulk_load_mode(cursor, MASTER_DATA_TABLES):
+        print("\n2. Generating suppliers...")
+        suppliers = generate_suppliers.generate_suppliers(num_suppliers)
+        generate_suppliers.insert_suppliers_to_db(suppliers, cursor=cursor)
+        
+        print("\n3. Generating warehouses...")
+        warehouses = generate_warehouses.generate_warehouses(num_warehouses)
+        generate_warehouses.insert_warehouses_to_db(warehouses, cursor=cursor)
+        
+        print("\n4. Generating products...")
+        products = generate_products.generate_products(num_products)
+        generate_products.insert_products_to_db(products, cursor=cursor)
+        
+        generate_products.link_products_to_suppliers(cursor=cursor)
+        
+        # Read active products back once and share them with every downstream
+        # generator. Ids are SERIAL and ON CONFLICT DO NOTHING keeps rows from
+        # earlier runs, so they come from the database, not the in-memory list.
+        active_products = DatabaseConnection.execute_query(
+            "SELECT product_id, sku, unit_price FROM products WHERE is_active = TRUE;",
+            fetch=True, cursor=cursor
+        )
+        
+        print("\n5. Generating replenishment rules...")
+        generate_replenishment_rules.generate_replenishment_rules(cursor=cursor)
     
-    print("\n4. Generating products...")
-    from scripts.data_generation.generate_products import generate_products, insert_products_to_db, link_products_to_suppliers
-    products = generate_products(DATA_GEN_CONFIG["num_products"])
-    insert_products_to_db(products)
-    link_products_to_suppliers()
-    
-    print("\n5. Generating replenishment rules...")
-    from scripts.data_generation.generate_replenishment_rules import generate_replenishment_rules
-    generate_replenishment_rules()
+    active_warehouses = [w for w in warehouses if w['is_active']]
     
     # Generate operational data for the target date
     print(f"\n6. Generating daily orders for {target_date}...")
-    generate_orders.generate_daily_orders(target_date)
+    generate_orders.generate_daily_orders(target_date, products=active_products)
     
     print(f"\n7. Generating stock snapshot for {target_date}...")
-    generate_stock.generate_stock_snapshot(target_date)
+    generate_stock.generate_stock_snapshot(target_date, products=active_products,
+                                           warehouses=active_warehouses)
     
     print("\n" + "=" * 60)
     print("✓ ALL DATA GENERATION COMPLETE!")
@@ -79,8 +98,11 @@ def generate_all_data(target_date=None):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Generate test data for procurement pipeline')
     parser.add_argument('--date', type=str, help='Date in YYYY-MM-DD format (default: today)')
+    parser.add_argument('--verbose', action='store_true', help='Log per-store and per-warehouse progress')
     args = parser.parse_args()
     
+    configure_logging(args.verbose)
+    
     try:
         generate_all_data(args.date)
     except Exception as e:
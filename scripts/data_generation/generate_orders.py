@@ -1,77 +1,123 @@
-"""Generate daily customer orders (POS data)."""
+"""Generate daily customer orders (POS data).
 
+Per-store item counts are logged at DEBUG, the day's total at INFO.
+"""
+
+import logging
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
-import random
-import json
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import orjson
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
-from config.config import DATA_GEN_CONFIG, RAW_ORDERS_DIR
+from config.config import configure_logging, DATA_GEN_CONFIG, RAW_ORDERS_DIR
 from database.db_connection import DatabaseConnection
+from scripts.data_generation.file_writer import write_files
+
+logger = logging.getLogger(__name__)
+
+
+def fake_orders_per_store(rng: np.random.Generator) -> int:
+    """Number of orders a POS store places in a day (50-200)."""
+    return int(rng.integers(50, 201))
 
-fake_orders_per_store = lambda: random.randint(50, 200)
+
+def _build_store(store_id: int, seed: np.random.SeedSequence, skus: list[str],
+                 unit_prices: np.ndarray, date_dir: Path, order_date: str) -> tuple[Path, bytearray, int]:
+    """Build one POS store's order file: (path, contents, order item count)."""
+    # Own RNG stream per worker (Generators are not thread-safe)
+    rng = np.random.default_rng(seed)
+    store_code = f"POS{store_id:03d}"
+    
+    num_orders = fake_orders_per_store(rng)
+    
+    # Draw the whole store's items at once: 1-5 distinct products per order
+    # (the leading columns of a random permutation per row), then one
+    # quantity per item. Products repeat only across orders.
+    items_per_order = np.minimum(rng.integers(1, 6, size=num_orders), len(skus))
+    order_nums = np.repeat(np.arange(num_orders), items_per_order)
+    permutations = np.argsort(rng.random((num_orders, len(skus))), axis=1)
+    product_idx = permutations[np.arange(len(skus)) < items_per_order[:, None]]
+    quantities = rng.integers(1, 11, size=len(order_nums))
+    prices = unit_prices[product_idx]
+    
+    # Invariant part of the order id, built once per store
+    id_prefix = f"ORD{order_date.replace('-', '')}{store_id:03d}"
+    
+    # JSONL (one JSON object per line for Hive compatibility), one line per order item
+    buf = bytearray()
+    for order_num, idx, quantity, price in zip(
+        order_nums.tolist(), product_idx.tolist(), quantities.tolist(), prices.tolist()
+    ):
+        buf += orjson.dumps({
+            "order_id": f"{id_prefix}{order_num:05d}",
+            "pos_store_id": store_code,
+            "sku": skus[idx],
+            "quantity": quantity,
+            "order_date": order_date,
+            "unit_price": price
+        })
+        buf += b'\n'
+    output_file = date_dir / f"{store_code}_{order_date}.json"
+    
+    return output_file, buf, len(order_nums)
 
 
-def generate_daily_orders(order_date: str, num_stores: int = 5):
-    """Generate orders for all POS stores for a given date."""
+def generate_daily_orders(order_date: str, num_stores: int = 5, products: list[dict] = None):
+    """Generate orders for all POS stores for a given date.
+    
+    Args:
+        products: Active products (sku, unit_price). Read from the database if None.
+    """
     # Get active products
-    products = DatabaseConnection.execute_query(
-        "SELECT sku, unit_price FROM products WHERE is_active = TRUE;",
-        fetch=True
-    )
+    if products is None:
+        products = DatabaseConnection.execute_query(
+            "SELECT sku, unit_price FROM products WHERE is_active = TRUE;",
+            fetch=True
+        )
     
     if not products:
-        print("No products found. Please generate products first.")
+        logger.warning("No products found. Please generate products first.")
         return
     
     # Create date directory
     date_dir = RAW_ORDERS_DIR / order_date
     date_dir.mkdir(parents=True, exist_ok=True)
     
-    total_orders = 0
-    
-    for store_id in range(1, num_stores + 1):
-        store_code = f"POS{store_id:03d}"
-        orders = []
-        
-        num_orders = fake_orders_per_store()
-        
-        for order_num in range(num_orders):
-            order_id = f"ORD{order_date.replace('-', '')}{store_id:03d}{order_num:05d}"
-            
-            # Each order has 1-5 items
-            num_items = random.randint(1, 5)
-            selected_products = random.sample(products, min(num_items, len(products)))
-            
-            for product in selected_products:
-                order = {
-                    "order_id": order_id,
-                    "pos_store_id": store_code,
-                    "sku": product['sku'],
-                    "quantity": random.randint(1, 10),
-                    "order_date": order_date,
-                    "unit_price": float(product['unit_price'])
-                }
-                orders.append(order)
-        
-        # Save to JSONL file (one JSON object per line for Hive compatibility)
-        output_file = date_dir / f"{store_code}_{order_date}.json"
-        with open(output_file, 'w') as f:
-            for order in orders:
-                json.dump(order, f)
-                f.write('\n')  # Each JSON object on its own line
-        
-        total_orders += len(orders)
-        print(f"  ✓ Generated {len(orders)} order items for {store_code}")
-    
-    print(f"✓ Total: {total_orders} order items across {num_stores} stores")
+    # Column arrays shared by all stores; prices converted from Decimal once
+    skus = [product['sku'] for product in products]
+    unit_prices = np.array([float(product['unit_price']) for product in products])
+    
+    # Store files are independent: build them in parallel
+    store_ids = range(1, num_stores + 1)
+    seeds = np.random.SeedSequence().spawn(num_stores)
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [
+            executor.submit(_build_store, store_id, seed, skus, unit_prices, date_dir, order_date)
+            for store_id, seed in zip(store_ids, seeds)
+        ]
+        results = [future.result() for future in futures]
+    
+    # Save to JSONL files, all writes in flight at once
+    write_files([(output_file, buf) for output_file, buf, _ in results])
+    counts = [count for _, _, count in results]
+    
+    for store_id, count in zip(store_ids, counts):
+        logger.debug("  ✓ Generated %d order items for POS%03d", count, store_id)
+    total_orders = sum(counts)
+    
+    logger.info("✓ Total: %d order items across %d stores", total_orders, num_stores)
 
 
 if __name__ == "__main__":
     from datetime import date
     
+    configure_logging()
+    
     # Generate for today
     today = date.today().strftime("%Y-%m-%d")
     num_stores = DATA_GEN_CONFIG["num_pos_stores"]
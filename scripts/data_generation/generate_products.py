@@ -1,16 +1,14 @@
-"""Generate test data for products using Faker."""
+"""Generate test data for products."""
 
 import sys
 from pathlib import Path
-from faker import Faker
 import random
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from config.config import DATA_GEN_CONFIG
 from database.db_connection import DatabaseConnection
-
-fake = Faker()
+from scripts.data_generation import fake_values
 
 
 # Product categories and examples
@@ -26,22 +24,30 @@ PRODUCT_CATEGORIES = {
     "Personal Care": ["Shampoo", "Toothpaste", "Deodorant", "Tissues"],
 }
 
+# Choices hoisted out of the generation loop
+_CATEGORY_KEYS = list(PRODUCT_CATEGORIES.keys())
+_UOM = ("UNIT", "KG", "L", "PACK")
+
+# Column order used for bulk loads
+PRODUCT_COLUMNS = ['sku', 'product_name', 'category', 'subcategory',
+                   'unit_price', 'unit_of_measure', 'is_active']
+
 
 def generate_products(num_products: int = 100) -> list[dict]:
     """Generate fake product data."""
     products = []
     
     for i in range(num_products):
-        category = random.choice(list(PRODUCT_CATEGORIES.keys()))
+        category = random.choice(_CATEGORY_KEYS)
         subcategory = random.choice(PRODUCT_CATEGORIES[category])
         
         product = {
             'sku': f"SKU{i+1:05d}",
-            'product_name': f"{fake.company()} {subcategory}",
+            'product_name': f"{fake_values.company()} {subcategory}",
             'category': category,
             'subcategory': subcategory,
             'unit_price': round(random.uniform(0.5, 50.0), 2),
-            'unit_of_measure': random.choice(["UNIT", "KG", "L", "PACK"]),
+            'unit_of_measure': random.choice(_UOM),
             'is_active': random.random() > 0.05  # 95% active
         }
         products.append(product)
@@ -49,12 +55,12 @@ def generate_products(num_products: int = 100) -> list[dict]:
     return products
 
 
-def insert_products_to_db(products: list[dict]):
-    """Insert products into the database."""
+def insert_products_to_db(products: list[dict], cursor=None):
+    """Insert products into the database (on the given session cursor, if any)."""
     query = """
         INSERT INTO products (sku, product_name, category, subcategory, 
                               unit_price, unit_of_measure, is_active)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
+        VALUES %s
         ON CONFLICT (sku) DO NOTHING;
     """
     
@@ -64,38 +70,47 @@ def insert_products_to_db(products: list[dict]):
         for p in products
     ]
     
-    DatabaseConnection.execute_many(query, data)
+    # Initial load: nothing to conflict with, so stream the rows with COPY
+    empty = DatabaseConnection.execute_query(
+        "SELECT NOT EXISTS (SELECT 1 FROM products) AS empty;", fetch=True, cursor=cursor
+    )[0]['empty']
+    if empty:
+        DatabaseConnection.bulk_copy('products', PRODUCT_COLUMNS, data, cursor=cursor)
+    else:
+        DatabaseConnection.execute_many(query, data, cursor=cursor)
     print(f"✓ Inserted {len(products)} products")
 
 
-def link_products_to_suppliers():
-    """Create supplier-product mappings."""
-    # Get all products and suppliers
-    products = DatabaseConnection.execute_query("SELECT product_id FROM products;", fetch=True)
-    suppliers = DatabaseConnection.execute_query("SELECT supplier_id FROM suppliers;", fetch=True)
-    
-    if not products or not suppliers:
-        print("No products or suppliers found. Please generate them first.")
-        return
-    
-    # Each product gets 1-2 suppliers
-    mappings = []
-    for product in products:
-        num_suppliers_per_product = random.randint(1, 2)
-        selected_suppliers = random.sample(suppliers, min(num_suppliers_per_product, len(suppliers)))
-        
-        for idx, supplier in enumerate(selected_suppliers):
-            is_primary = (idx == 0)  # First one is primary
-            mappings.append((supplier['supplier_id'], product['product_id'], is_primary))
+def link_products_to_suppliers(cursor=None):
+    """Create supplier-product mappings.
     
+    Generated entirely in PostgreSQL: each product gets 1-2 random
+    suppliers, the first one drawn being primary. Runs on the given
+    session cursor, if any.
+    """
     query = """
-        INSERT INTO supplier_products (supplier_id, product_id, is_primary_supplier)
-        VALUES (%s, %s, %s)
-        ON CONFLICT (supplier_id, product_id) DO NOTHING;
+        WITH inserted AS (
+            INSERT INTO supplier_products (supplier_id, product_id, is_primary_supplier)
+            SELECT
+                s.supplier_id,
+                p.product_id,
+                ROW_NUMBER() OVER (PARTITION BY p.product_id ORDER BY s.pick) = 1
+            FROM products p
+            CROSS JOIN LATERAL (
+                -- References p so the draw is re-run for every product
+                SELECT supplier_id, random() + 0 * p.product_id AS pick
+                FROM suppliers
+                ORDER BY pick
+                LIMIT 1 + floor(random() * 2)::int
+            ) s
+            ON CONFLICT (supplier_id, product_id) DO NOTHING
+            RETURNING 1
+        )
+        SELECT COUNT(*) AS created FROM inserted;
     """
     
-    DatabaseConnection.execute_many(query, mappings)
-    print(f"✓ Created {len(mappings)} supplier-product mappings")
+    created = DatabaseConnection.execute_query(query, fetch=True, cursor=cursor)[0]['created']
+    print(f"✓ Created {created} supplier-product mappings")
 
 
 if __name__ == "__main__":
@@ -2,59 +2,62 @@
 
 import sys
 from pathlib import Path
-import random
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from database.db_connection import DatabaseConnection
 
 
-def generate_replenishment_rules():
+def generate_replenishment_rules(cursor=None):
     """Generate centralized replenishment rules (one per product).
     
     This is a centralized procurement system:
     - One rule per SKU globally (not per warehouse)
     - Stock is aggregated across all warehouses
     - Net demand is calculated per SKU centrally
-    """
-    # Get all products
-    products = DatabaseConnection.execute_query(
-        "SELECT product_id FROM products WHERE is_active = TRUE;", 
-        fetch=True
-    )
-    
-    if not products:
-        print("No products found. Please generate products first.")
-        return
     
-    rules = []
-    # Create ONE rule per product (centralized model)
-    for product in products:
-        # Generate realistic procurement constraints
-        case_size = random.choice([6, 12, 24])
-        pack_size = random.choice([1, 4, 6])
-        
-        rule = (
-            product['product_id'],
-            random.randint(10, 100),  # safety_stock
-            random.choice([1, case_size, case_size * 2]),  # min_order_quantity
-            pack_size,
-            case_size,
-            random.randint(500, 2000),  # max_order_quantity
-            random.randint(50, 200),  # reorder_point
-        )
-        rules.append(rule)
+    Rules are generated entirely in PostgreSQL from the active products.
     
+    Args:
+        cursor: Session cursor to run on (see DatabaseConnection.session).
+    """
+    # Create ONE rule per product (centralized model) with realistic
+    # procurement constraints. The inner query draws case_size once per
+    # product (OFFSET 0 keeps it from being inlined and re-drawn), so the
+    # MOQ can be picked from [1, case_size, 2 * case_size].
     query = """
-        INSERT INTO replenishment_rules 
-        (product_id, safety_stock, min_order_quantity, 
-         pack_size, case_size, max_order_quantity, reorder_point)
-        VALUES (%s, %s, %s, %s, %s, %s, %s)
-        ON CONFLICT (product_id) DO NOTHING;
+        WITH inserted AS (
+            INSERT INTO replenishment_rules 
+            (product_id, safety_stock, min_order_quantity, 
+             pack_size, case_size, max_order_quantity, reorder_point)
+            SELECT
+                product_id,
+                safety_stock,
+                (ARRAY[1, case_size, case_size * 2])[1 + floor(random() * 3)::int],
+                pack_size,
+                case_size,
+                max_order_quantity,
+                reorder_point
+            FROM (
+                SELECT
+                    product_id,
+                    10 + floor(random() * 91)::int AS safety_stock,
+                    (ARRAY[1, 4, 6])[1 + floor(random() * 3)::int] AS pack_size,
+                    (ARRAY[6, 12, 24])[1 + floor(random() * 3)::int] AS case_size,
+                    500 + floor(random() * 1501)::int AS max_order_quantity,
+                    50 + floor(random() * 151)::int AS reorder_point
+                FROM products
+                WHERE is_active = TRUE
+                OFFSET 0
+            ) p
+            ON CONFLICT (product_id) DO NOTHING
+            RETURNING 1
+        )
+        SELECT COUNT(*) AS created FROM inserted;
     """
     
-    DatabaseConnection.execute_many(query, rules)
-    print(f"✓ Created {len(rules)} replenishment rules (one per product - centralized model)")
+    created = DatabaseConnection.execute_query(query, fetch=True, cursor=cursor)[0]['created']
+    print(f"✓ Created {created} replenishment rules (one per product - centralized model)")
 
 
 if __name__ == "__main__":
@@ -1,73 +1,108 @@
-"""Generate warehouse stock snapshots."""
+"""Generate warehouse stock snapshots.
 
+Logs one summary line at INFO; per-warehouse counts only at DEBUG.
+"""
+
+import logging
+import os
 import sys
 from pathlib import Path
 from datetime import datetime
-import random
-import json
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import orjson
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
-from config.config import RAW_STOCK_DIR
+from config.config import configure_logging, RAW_STOCK_DIR
 from database.db_connection import DatabaseConnection
+from scripts.data_generation.file_writer import write_files
+
+logger = logging.getLogger(__name__)
+
 
+def _build_warehouse(warehouse_code: str, seed: np.random.SeedSequence, skus: list[str],
+                     date_dir: Path, snapshot_date: str) -> tuple[Path, bytearray, int]:
+    """Build one warehouse's stock snapshot file: (path, contents, record count)."""
+    rng = np.random.default_rng(seed)
+    
+    # Generate realistic stock levels for every product in one draw
+    available = rng.integers(0, 501, size=len(skus))
+    reserved = rng.integers(0, np.minimum(available, 50) + 1)
+    
+    # One JSONL line per SKU in this warehouse
+    buf = bytearray()
+    for sku, available_stock, reserved_stock in zip(skus, available.tolist(), reserved.tolist()):
+        buf += orjson.dumps({
+            "warehouse_code": warehouse_code,
+            "sku": sku,
+            "available_stock": available_stock,
+            "reserved_stock": reserved_stock,
+            "snapshot_date": snapshot_date
+        })
+        buf += b'\n'
+    output_file = date_dir / f"{warehouse_code}_{snapshot_date}.json"
+    
+    return output_file, buf, len(skus)
 
-def generate_stock_snapshot(snapshot_date: str):
-    """Generate end-of-day stock levels for all warehouses."""
+
+def generate_stock_snapshot(snapshot_date: str, products: list[dict] = None,
+                            warehouses: list[dict] = None):
+    """Generate end-of-day stock levels for all warehouses.
+    
+    Args:
+        products: Active products (sku). Read from the database if None.
+        warehouses: Active warehouses (warehouse_code). Read from the database if None.
+    """
     # Get active products and warehouses
-    products = DatabaseConnection.execute_query(
-        "SELECT sku FROM products WHERE is_active = TRUE;",
-        fetch=True
-    )
-    warehouses = DatabaseConnection.execute_query(
-        "SELECT warehouse_code FROM warehouses WHERE is_active = TRUE;",
-        fetch=True
-    )
+    if products is None:
+        products = DatabaseConnection.execute_query(
+            "SELECT sku FROM products WHERE is_active = TRUE;",
+            fetch=True
+        )
+    if warehouses is None:
+        warehouses = DatabaseConnection.execute_query(
+            "SELECT warehouse_code FROM warehouses WHERE is_active = TRUE;",
+            fetch=True
+        )
     
     if not products or not warehouses:
-        print("No products or warehouses found. Please generate them first.")
+        logger.warning("No products or warehouses found. Please generate them first.")
         return
     
     # Create date directory
     date_dir = RAW_STOCK_DIR / snapshot_date
     date_dir.mkdir(parents=True, exist_ok=True)
     
-    total_records = 0
+    skus = [product['sku'] for product in products]
+    warehouse_codes = [warehouse['warehouse_code'] for warehouse in warehouses]
+    
+    # Warehouse files are independent: build them in parallel, each worker
+    # with its own RNG stream (Generators are not thread-safe)
+    seeds = np.random.SeedSequence().spawn(len(warehouse_codes))
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = [
+            executor.submit(_build_warehouse, warehouse_code, seed, skus, date_dir, snapshot_date)
+            for warehouse_code, seed in zip(warehouse_codes, seeds)
+        ]
+        results = [future.result() for future in futures]
     
-    for warehouse in warehouses:
-        warehouse_code = warehouse['warehouse_code']
-        stock_data = []
-        
-        for product in products:
-            # Generate realistic stock levels
-            available_stock = random.randint(0, 500)
-            reserved_stock = random.randint(0, min(available_stock, 50))
-            
-            stock_record = {
-                "warehouse_code": warehouse_code,
-                "sku": product['sku'],
-                "available_stock": available_stock,
-                "reserved_stock": reserved_stock,
-                "snapshot_date": snapshot_date
-            }
-            stock_data.append(stock_record)
-        
-        # Save to JSONL file (one JSON object per line for Hive compatibility)
-        output_file = date_dir / f"{warehouse_code}_{snapshot_date}.json"
-        with open(output_file, 'w') as f:
-            for record in stock_data:
-                json.dump(record, f)
-                f.write('\n')  # Each JSON object on its own line
-        
-        total_records += len(stock_data)
-        print(f"  ✓ Generated {len(stock_data)} stock records for {warehouse_code}")
+    # Save to JSONL files, all writes in flight at once
+    write_files([(output_file, buf) for output_file, buf, _ in results])
+    counts = [count for _, _, count in results]
     
-    print(f"✓ Total: {total_records} stock records across {len(warehouses)} warehouses")
+    for warehouse_code, count in zip(warehouse_codes, counts):
+        logger.debug("  ✓ Generated %d stock records for %s", count, warehouse_code)
+    total_records = sum(counts)
+    
+    logger.info("✓ Total: %d stock records across %d warehouses", total_records, len(warehouses))
 
 
 if __name__ == "__main__":
     from datetime import date
     
+    configure_logging()
+    
     # Generate for today
     today = date.today().strftime("%Y-%m-%d")
     
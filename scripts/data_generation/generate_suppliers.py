@@ -1,16 +1,14 @@
-"""Generate test data for suppliers using Faker."""
+"""Generate test data for suppliers."""
 
 import sys
 from pathlib import Path
-from faker import Faker
 import random
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from config.config import DATA_GEN_CONFIG
 from database.db_connection import DatabaseConnection
-
-fake = Faker()
+from scripts.data_generation import fake_values
 
 
 def generate_suppliers(num_suppliers: int = 10) -> list[dict]:
@@ -26,9 +24,9 @@ def generate_suppliers(num_suppliers: int = 10) -> list[dict]:
     for i in range(num_suppliers):
         supplier = {
             'supplier_code': f"SUP{i+1:03d}",
-            'supplier_name': f"{fake.company()} {random.choice(supplier_types)}",
-            'contact_email': fake.company_email(),
-            'contact_phone': fake.phone_number()[:20],
+            'supplier_name': f"{fake_values.company()} {random.choice(supplier_types)}",
+            'contact_email': fake_values.company_email(),
+            'contact_phone': fake_values.phone_number(),
             'lead_time_days': random.randint(1, 5),
             'is_active': True
         }
@@ -37,12 +35,12 @@ def generate_suppliers(num_suppliers: int = 10) -> list[dict]:
     return suppliers
 
 
-def insert_suppliers_to_db(suppliers: list[dict]):
-    """Insert suppliers into the database."""
+def insert_suppliers_to_db(suppliers: list[dict], cursor=None):
+    """Insert suppliers into the database (on the given session cursor, if any)."""
     query = """
         INSERT INTO suppliers (supplier_code, supplier_name, contact_email, 
                                contact_phone, lead_time_days, is_active)
-        VALUES (%s, %s, %s, %s, %s, %s)
+        VALUES %s
         ON CONFLICT (supplier_code) DO NOTHING;
     """
     
@@ -52,7 +50,7 @@ def insert_suppliers_to_db(suppliers: list[dict]):
         for s in suppliers
     ]
     
-    DatabaseConnection.execute_many(query, data)
+    DatabaseConnection.execute_many(query, data, cursor=cursor)
     print(f"✓ Inserted {len(suppliers)} suppliers")
 
 
@@ -35,12 +35,12 @@ def generate_warehouses(num_warehouses: int = 3) -> list[dict]:
     return warehouses
 
 
-def insert_warehouses_to_db(warehouses: list[dict]):
-    """Insert warehouses into the database."""
+def insert_warehouses_to_db(warehouses: list[dict], cursor=None):
+    """Insert warehouses into the database (on the given session cursor, if any)."""
     query = """
         INSERT INTO warehouses (warehouse_code, warehouse_name, location, 
                                 capacity_cubic_meters, is_active)
-        VALUES (%s, %s, %s, %s, %s)
+        VALUES %s
         ON CONFLICT (warehouse_code) DO NOTHING;
     """
     
@@ -50,7 +50,7 @@ def insert_warehouses_to_db(warehouses: list[dict]):
         for w in warehouses
     ]
     
-    DatabaseConnection.execute_many(query, data)
+    DatabaseConnection.execute_many(query, data, cursor=cursor)
     print(f"✓ Inserted {len(warehouses)} warehouses")
 
 
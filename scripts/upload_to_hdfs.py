@@ -1,6 +1,7 @@
 """Upload local data files to HDFS."""
 
-import subprocess
+import asyncio
+import logging
 import sys
 from pathlib import Path
 from datetime import date
@@ -8,115 +9,122 @@ import argparse
 
 # Add parent directory to path
 sys.path.append(str(Path(__file__).parent.parent))
-from config.config import RAW_ORDERS_DIR, RAW_STOCK_DIR
+from config.config import configure_logging, RAW_ORDERS_DIR, RAW_STOCK_DIR
 
+logger = logging.getLogger(__name__)
 
-def run_command(command: list[str], description: str):
-    """Execute a shell command and handle errors."""
-    try:
-        print(f"  → {description}...")
-        result = subprocess.run(command, capture_output=True, text=True, check=True)
-        if result.stdout:
-            print(f"    {result.stdout.strip()}")
-        return True
-    except subprocess.CalledProcessError as e:
-        print(f"    ✗ Error: {e.stderr.strip()}")
+
+async def run_command(command: list[str], description: str, show_output: bool = False):
+    """Execute a shell command asynchronously and handle errors.
+    
+    Command output is logged at DEBUG, or at INFO with show_output.
+    """
+    logger.info("  → %s...", description)
+    proc = await asyncio.create_subprocess_exec(
+        *command, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+    )
+    stdout, stderr = await proc.communicate()
+    
+    if proc.returncode != 0:
+        logger.error("    ✗ %s failed: %s", description, stderr.decode().strip())
         return False
+    if stdout:
+        logger.log(logging.INFO if show_output else logging.DEBUG, "    %s", stdout.decode().strip())
+    return True
 
 
 def upload_to_hdfs(execution_date: str):
     """Upload orders and stock data to HDFS for a specific date."""
-    print(f"\n{'='*60}")
-    print(f"UPLOADING DATA TO HDFS - {execution_date}")
-    print(f"{'='*60}\n")
+    return asyncio.run(upload_to_hdfs_async(execution_date))
+
+
+async def upload_to_hdfs_async(execution_date: str):
+    """Upload orders and stock data to HDFS, running the file uploads concurrently."""
+    logger.info(f"\n{'='*60}")
+    logger.info(f"UPLOADING DATA TO HDFS - {execution_date}")
+    logger.info(f"{'='*60}\n")
     
     # Check if local data exists
     orders_dir = RAW_ORDERS_DIR / execution_date
     stock_dir = RAW_STOCK_DIR / execution_date
     
     if not orders_dir.exists():
-        print(f"✗ Error: Orders directory not found: {orders_dir}")
-        print(f"  Run: python scripts/data_generation/generate_orders.py")
+        logger.error(f"✗ Error: Orders directory not found: {orders_dir}")
+        logger.info("  Run: python scripts/data_generation/generate_orders.py")
         return False
     
     if not stock_dir.exists():
-        print(f"✗ Error: Stock directory not found: {stock_dir}")
-        print(f"  Run: python scripts/data_generation/generate_stock.py")
+        logger.error(f"✗ Error: Stock directory not found: {stock_dir}")
+        logger.info("  Run: python scripts/data_generation/generate_stock.py")
         return False
     
     # Count files to upload
     order_files = list(orders_dir.glob("*.json"))
     stock_files = list(stock_dir.glob("*.json"))
     
-    print(f"Found {len(order_files)} order files and {len(stock_files)} stock files\n")
+    logger.info(f"Found {len(order_files)} order files and {len(stock_files)} stock files\n")
     
-    # HDFS paths
-    hdfs_orders_path = f"/procurement/raw/orders/{execution_date}"
-    hdfs_stock_path = f"/procurement/raw/stock/{execution_date}"
+    # HDFS paths (Hive partition layout: <partition_key>=<date>)
+    hdfs_orders_path = f"/procurement/raw/orders/order_date={execution_date}"
+    hdfs_stock_path = f"/procurement/raw/stock/snapshot_date={execution_date}"
     
     # Local paths (as seen from inside hadoop_client container)
     local_orders_path = f"/data/raw/orders/{execution_date}"
     local_stock_path = f"/data/raw/stock/{execution_date}"
     
-    print("Step 1: Creating HDFS directories...")
+    logger.info("Step 1: Creating HDFS directories...")
     success = True
     
-    # Create HDFS directories
-    success &= run_command(
-        ["docker", "exec", "hadoop_client", "hdfs", "dfs", "-mkdir", "-p", hdfs_orders_path],
-        f"Create {hdfs_orders_path}"
-    )
-    
-    success &= run_command(
-        ["docker", "exec", "hadoop_client", "hdfs", "dfs", "-mkdir", "-p", hdfs_stock_path],
-        f"Create {hdfs_stock_path}"
+    # Create both HDFS directories in one call
+    success &= await run_command(
+        ["docker", "exec", "hadoop_client", "hdfs", "dfs", "-mkdir", "-p", hdfs_orders_path, hdfs_stock_path],
+        f"Create {hdfs_orders_path} and {hdfs_stock_path}"
     )
     
     if not success:
-        print("\n✗ Failed to create HDFS directories")
+        logger.error("\n✗ Failed to create HDFS directories")
         return False
     
-    print("\nStep 2: Uploading order files...")
-    # Upload files individually to avoid wildcard issues
-    for order_file in order_files:
-        filename = order_file.name
-        success &= run_command(
+    logger.info("\nStep 2-3: Uploading order and stock files...")
+    # One put per directory (one JVM start each); files are listed
+    # explicitly to avoid wildcard issues. The two puts run concurrently.
+    uploads = [
+        run_command(
             ["docker", "exec", "hadoop_client", "hdfs", "dfs", "-put", "-f",
-             f"{local_orders_path}/{filename}", f"{hdfs_orders_path}/{filename}"],
-            f"Upload {filename}"
+             *(f"{local_path}/{f.name}" for f in files), hdfs_path],
+            f"Upload {len(files)} files to {hdfs_path}"
         )
-    
-    print("\nStep 3: Uploading stock files...")
-    for stock_file in stock_files:
-        filename = stock_file.name
-        success &= run_command(
-            ["docker", "exec", "hadoop_client", "hdfs", "dfs", "-put", "-f",
-             f"{local_stock_path}/{filename}", f"{hdfs_stock_path}/{filename}"],
-            f"Upload {filename}"
+        for files, local_path, hdfs_path in (
+            (order_files, local_orders_path, hdfs_orders_path),
+            (stock_files, local_stock_path, hdfs_stock_path),
         )
-    
-    if not success:
-        print("\n✗ Upload failed")
+        if files
+    ]
+    results = await asyncio.gather(*uploads, return_exceptions=True)
+    failures = [result for result in results if result is not True]
+    for result in failures:
+        if isinstance(result, Exception):
+            logger.error("    ✗ Error: %s", result)
+    
+    if failures:
+        logger.error(f"\n✗ Upload failed ({len(failures)} of {len(results)} directory uploads)")
         return False
-    
-    print("\nStep 4: Verifying upload...")
-    print(f"\n  Orders in HDFS ({hdfs_orders_path}):")
-    run_command(
-        ["docker", "exec", "hadoop_client", "hdfs", "dfs", "-ls", hdfs_orders_path],
-        "List orders"
-    )
-    
-    print(f"\n  Stock in HDFS ({hdfs_stock_path}):")
-    run_command(
-        ["docker", "exec", "hadoop_client", "hdfs", "dfs", "-ls", hdfs_stock_path],
-        "List stock"
+    logger.info(f"  ✓ Uploaded {len(order_files) + len(stock_files)} files")
+    
+    logger.info("\nStep 4: Verifying upload...")
+    # One listing for both directories (one JVM start); ls prints a
+    # "Found N items" header per directory
+    logger.info(f"\n  Orders and stock in HDFS ({hdfs_orders_path}, {hdfs_stock_path}):")
+    await run_command(
+        ["docker", "exec", "hadoop_client", "hdfs", "dfs", "-ls", hdfs_orders_path, hdfs_stock_path],
+        "List uploads", show_output=True
     )
     
-    print(f"\n{'='*60}")
-    print(f"✓ UPLOAD COMPLETE - Data available in HDFS")
-    print(f"{'='*60}\n")
-    print(f"Next step:")
-    print(f"  python src/run_pipeline.py --date {execution_date}")
+    logger.info(f"\n{'='*60}")
+    logger.info("✓ UPLOAD COMPLETE - Data available in HDFS")
+    logger.info(f"{'='*60}\n")
+    logger.info("Next step:")
+    logger.info(f"  python src/run_pipeline.py --date {execution_date}")
     
     return True
 
@@ -160,7 +168,7 @@ Examples:
             date.fromisoformat(args.date)
             execution_date = args.date
         except ValueError:
-            print(f"✗ Error: Invalid date format '{args.date}'. Use YYYY-MM-DD")
+            logger.error(f"✗ Error: Invalid date format '{args.date}'. Use YYYY-MM-DD")
             return 1
     
     # Upload to HDFS
@@ -169,4 +177,5 @@ Examples:
 
 
 if __name__ == "__main__":
+    configure_logging()
     sys.exit(main())